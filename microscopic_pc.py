@@ -4,19 +4,85 @@ from PIL import Image, ImageTk
 import cv2
 import numpy as np
 import os
+import math
+import struct
+import time
+import zlib
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 
-# --- Core Image Analysis (unchanged) ---
-def analyze_image_segments(cv_image):
+# --- Core Image Analysis ---
+def _split_range(length, parts):
+    step = max(1, -(-length // max(1, parts)))
+    return [(start, min(start + step, length)) for start in range(0, length, step)]
+
+def _map_bands(pool, num_bands, func, image, halo):
+    # Run a neighbourhood operation on overlapping horizontal bands. Each band carries
+    # `halo` extra rows on both sides so the cropped output matches the full-image call.
+    if pool is None: return func(image)
+    height = image.shape[0]
+    def run_band(band):
+        y0, y1 = band
+        top, bottom = max(0, y0 - halo), min(height, y1 + halo)
+        return func(image[top:bottom])[y0 - top:y1 - top]
+    return np.vstack(list(pool.map(run_band, _split_range(height, num_bands))))
+
+def _label_bounding_boxes(markers):
+    # Row and column span of every watershed label in one pass over rows and one over
+    # columns. Labels are shifted by one so the -1 boundary value gets its own slot.
+    size = int(markers.max()) + 2
+    height, width = markers.shape
+    top, bottom = np.zeros(size, dtype=np.int64), np.zeros(size, dtype=np.int64)
+    left, right = np.zeros(size, dtype=np.int64), np.zeros(size, dtype=np.int64)
+    for y in range(height - 1, -1, -1): top[markers[y] + 1] = y
+    for y in range(height): bottom[markers[y] + 1] = y
+    for x in range(width - 1, -1, -1): left[markers[:, x] + 1] = x
+    for x in range(width): right[markers[:, x] + 1] = x
+    return top[1:], bottom[1:], left[1:], right[1:]
+
+def _extract_segments(markers, labels, boxes):
+    top, bottom, left, right = boxes
+    height, width = markers.shape
+    segments = []
+    for label in labels:
+        # Crop to the label with a one-pixel background margin; the offset maps the
+        # contour back to plate coordinates, identical to tracing a full-plate mask.
+        y0, x0 = max(0, top[label] - 1), max(0, left[label] - 1)
+        y1, x1 = min(height, bottom[label] + 2), min(width, right[label] + 2)
+        mask = np.zeros((y1 - y0, x1 - x0), dtype="uint8")
+        mask[markers[y0:y1, x0:x1] == label] = 255
+        cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(int(x0), int(y0)))
+        if cnts:
+            contour = cnts[0]
+            area = cv2.contourArea(contour)
+            perimeter = cv2.arcLength(contour, True)
+            circularity = (4 * np.pi * area) / (perimeter**2) if perimeter > 0 else 0
+            segments.append({'contour': contour, 'area': area, 'circularity': circularity})
+    return segments
+
+def analyze_image_segments(cv_image, num_threads=1):
     if cv_image is None: return []
-    gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
+    if num_threads > 1:
+        with ThreadPoolExecutor(max_workers=num_threads) as pool:
+            return _analyze_image_segments(cv_image, pool, num_threads)
+    return _analyze_image_segments(cv_image, None, 1)
+
+def _analyze_image_segments(cv_image, pool, num_threads):
     block_size, c_val = 55, 12
-    binary_img = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, block_size, c_val)
     kernel = np.ones((3, 3), np.uint8)
-    opening = cv2.morphologyEx(binary_img, cv2.MORPH_OPEN, kernel, iterations=2)
+    def threshold_and_open(gray_band):
+        binary_img = cv2.adaptiveThreshold(gray_band, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, block_size, c_val)
+        return cv2.morphologyEx(binary_img, cv2.MORPH_OPEN, kernel, iterations=2)
+    gray = _map_bands(pool, num_threads, lambda band: cv2.cvtColor(band, cv2.COLOR_BGR2GRAY), cv_image, 0)
+    # Gaussian window radius plus two 3x3 erosions and two 3x3 dilations.
+    opening = _map_bands(pool, num_threads, threshold_and_open, gray, block_size // 2 + 4)
+    # The distance transform, its global maximum, labelling and watershed need the whole plate.
     dist_transform = cv2.distanceTransform(opening, cv2.DIST_L2, 5)
     _, sure_fg = cv2.threshold(dist_transform, 0.2 * dist_transform.max(), 255, 0)
-    sure_bg = cv2.dilate(opening, kernel, iterations=3)
+    sure_bg = _map_bands(pool, num_threads, lambda band: cv2.dilate(band, kernel, iterations=3), opening, 3)
     sure_fg = np.uint8(sure_fg)
     unknown = cv2.subtract(sure_bg, sure_fg)
     _, markers = cv2.connectedComponents(sure_fg)
@@ -24,19 +90,249 @@ def analyze_image_segments(cv_image):
     markers[unknown == 255] = 0
     bgr_image_for_watershed = cv_image.copy()
     cv2.watershed(bgr_image_for_watershed, markers)
-    segments = []
-    for label in np.unique(markers):
-        if label < 2: continue
-        mask = np.zeros(gray.shape, dtype="uint8")
-        mask[markers == label] = 255
-        cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        if cnts:
-            contour = cnts[0]
-            area = cv2.contourArea(contour)
-            perimeter = cv2.arcLength(contour, True)
-            circularity = (4 * np.pi * area) / (perimeter**2) if perimeter > 0 else 0
-            segments.append({'contour': contour, 'area': area, 'circularity': circularity})
-    return segments
+    labels = [label for label in np.unique(markers) if label >= 2]
+    boxes = _label_bounding_boxes(markers)
+    if pool is None: return _extract_segments(markers, labels, boxes)
+    # Small chunks keep the workers balanced; results are joined in label order so the
+    # output is identical to the serial path.
+    chunks = [labels[a:b] for a, b in _split_range(len(labels), num_threads * 4)]
+    return [seg for part in pool.map(lambda chunk: _extract_segments(markers, chunk, boxes), chunks) for seg in part]
+
+def segments_equal(a, b):
+    if len(a) != len(b): return False
+    return all(sa['area'] == sb['area'] and sa['circularity'] == sb['circularity'] and np.array_equal(sa['contour'], sb['contour']) for sa, sb in zip(a, b))
+
+def benchmark_segmentation(cv_image, thread_counts, repeats=3):
+    results, baseline, serial_time = [], None, None
+    for num_threads in thread_counts:
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            segments = analyze_image_segments(cv_image, num_threads)
+            best = min(best, time.perf_counter() - start)
+        if baseline is None: baseline, serial_time = segments, best
+        elif not segments_equal(baseline, segments):
+            raise RuntimeError(f"Segmentation with {num_threads} threads differs from the {thread_counts[0]}-thread result.")
+        results.append((num_threads, best, serial_time / best))
+    return results
+
+# --- Annotated Image Export ---
+DEFAULT_FILTER_RANGES = (75, 2000, 0.65, 1.00)
+ACCEPTED_COLOR = (0, 255, 0)
+REMOVED_COLOR = (0, 0, 255)
+
+def in_filter_range(seg, filter_ranges):
+    min_a, max_a, min_c, max_c = filter_ranges
+    return min_a <= seg['area'] <= max_a and min_c <= seg['circularity'] <= max_c
+
+def select_particles(segments, manual_additions, manual_removals, filter_ranges):
+    accepted = [seg for i, seg in enumerate(segments) if i not in manual_removals and in_filter_range(seg, filter_ranges)]
+    accepted += [seg for seg in manual_additions if in_filter_range(seg, filter_ranges)]
+    removed = [segments[i] for i in sorted(manual_removals) if i < len(segments)]
+    return accepted, removed
+
+class PngStreamWriter:
+    # Minimal 8-bit RGB PNG encoder that accepts the image a strip of rows at a time,
+    # so the full annotated plate never has to exist in memory.
+    def __init__(self, path, width, height):
+        self.path, self.width = path, width
+        self.file = open(path, 'wb')
+        self.compressor = zlib.compressobj(6)
+        self.file.write(b'\x89PNG\r\n\x1a\n')
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    def _write_chunk(self, kind, data):
+        self.file.write(struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+    def write_rows(self, bgr_rows):
+        rgb = cv2.cvtColor(bgr_rows, cv2.COLOR_BGR2RGB)
+        scanlines = np.zeros((rgb.shape[0], self.width * 3 + 1), dtype=np.uint8)
+        scanlines[:, 1:] = rgb.reshape(rgb.shape[0], -1)
+        data = self.compressor.compress(scanlines.tobytes())
+        if data: self._write_chunk(b'IDAT', data)
+
+    def close(self):
+        self._write_chunk(b'IDAT', self.compressor.flush())
+        self._write_chunk(b'IEND', b'')
+        self.file.close()
+
+    def __enter__(self): return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None: self.close()
+        else: self.file.close(); os.remove(self.path)
+
+def _marker_size(w, h): return np.maximum(np.maximum(w, h), 3)
+
+def _vertical_extents(contours, as_markers=False):
+    # Row span each item can touch once drawn, used to pick the items for a strip.
+    boxes = np.array([cv2.boundingRect(c) for c in contours], dtype=np.int64).reshape(-1, 4)
+    margins = _marker_size(boxes[:, 2], boxes[:, 3]) // 2 + 1 if as_markers else 1
+    return boxes, boxes[:, 1] - margins, boxes[:, 1] + boxes[:, 3] + margins
+
+def _render_strip(cv_image, y0, y1, accepted, accepted_extents, removed, removed_extents):
+    _, tops, bottoms = accepted_extents
+    accepted_hits = np.flatnonzero((tops < y1) & (bottoms > y0))
+    boxes, removed_tops, removed_bottoms = removed_extents
+    removed_hits = np.flatnonzero((removed_tops < y1) & (removed_bottoms > y0))
+    # Grow the buffer to hold every item touching the strip, so no line is clipped at a
+    # seam and the rows match a single full-image draw whatever the strip height.
+    top = int(min([y0] + list(tops[accepted_hits]) + list(removed_tops[removed_hits])))
+    bottom = int(max([y1] + list(bottoms[accepted_hits]) + list(removed_bottoms[removed_hits])))
+    top, bottom = max(0, top), min(cv_image.shape[0], bottom)
+    buffer = cv_image[top:bottom].copy()
+    for i in accepted_hits:
+        cv2.drawContours(buffer, [accepted[i]['contour']], -1, ACCEPTED_COLOR, 1, offset=(0, -top))
+    for i in removed_hits:
+        x, y, w, h = boxes[i]
+        cv2.drawMarker(buffer, (int(x + w // 2), int(y + h // 2 - top)), REMOVED_COLOR, cv2.MARKER_TILTED_CROSS, int(_marker_size(w, h)), 1)
+    return buffer[y0 - top:y1 - top]
+
+def _write_image(path, image):
+    if not cv2.imwrite(path, image): raise OSError(f"Failed to write image: {path}")
+
+def _write_tile_row(tile_dir, strip, tile_row, tile_size):
+    for col, x in enumerate(range(0, strip.shape[1], tile_size)):
+        _write_image(os.path.join(tile_dir, "0", f"{tile_row}_{col}.png"), strip[:, x:x + tile_size])
+
+def _build_tile_pyramid(tile_dir, width, height, tile_size):
+    # Level 0 holds full-resolution tiles; each further level halves the previous one,
+    # built from at most four child tiles, until the plate fits in a single tile.
+    level = 0
+    while width > tile_size or height > tile_size:
+        child_rows, child_cols = -(-height // tile_size), -(-width // tile_size)
+        width, height = (width + 1) // 2, (height + 1) // 2
+        os.makedirs(os.path.join(tile_dir, str(level + 1)), exist_ok=True)
+        for row in range(-(-height // tile_size)):
+            for col in range(-(-width // tile_size)):
+                mosaic = np.vstack([np.hstack([cv2.imread(os.path.join(tile_dir, str(level), f"{child_row}_{child_col}.png"))
+                                               for child_col in range(2 * col, min(2 * col + 2, child_cols))])
+                                    for child_row in range(2 * row, min(2 * row + 2, child_rows))])
+                tile = cv2.resize(mosaic, ((mosaic.shape[1] + 1) // 2, (mosaic.shape[0] + 1) // 2), interpolation=cv2.INTER_AREA)
+                _write_image(os.path.join(tile_dir, str(level + 1), f"{row}_{col}.png"), tile)
+        level += 1
+    return level + 1
+
+def check_export_options(output_path, strip_rows=512, preview_path=None, preview_factor=8, tile_dir=None, tile_size=256):
+    if not output_path.lower().endswith('.png'): raise ValueError("Annotated export is written as PNG; use a .png output path.")
+    for name, value in (("strip rows", strip_rows), ("preview factor", preview_factor), ("tile size", tile_size)):
+        if value <= 0: raise ValueError(f"The {name} must be a positive integer, got {value}.")
+    if preview_path and not cv2.haveImageWriter(preview_path): raise ValueError(f"Unsupported preview image format: {preview_path}")
+    # Refuse to mix levels and tiles with those of an earlier, differently sized export.
+    if tile_dir and os.path.isdir(tile_dir) and os.listdir(tile_dir): raise FileExistsError(f"Tile directory is not empty: {tile_dir}")
+
+def export_annotated_image(cv_image, segments, manual_additions, manual_removals, filter_ranges, output_path,
+                           strip_rows=512, preview_path=None, preview_factor=8, tile_dir=None, tile_size=256):
+    check_export_options(output_path, strip_rows, preview_path, preview_factor, tile_dir, tile_size)
+    img_h, img_w = cv_image.shape[:2]
+    accepted, removed = select_particles(segments, manual_additions, manual_removals, filter_ranges)
+    accepted_extents = _vertical_extents([seg['contour'] for seg in accepted])
+    removed_extents = _vertical_extents([seg['contour'] for seg in removed], as_markers=True)
+    # Strips are aligned to tile and preview boundaries so each piece is cut from a single strip.
+    unit = math.lcm(tile_size if tile_dir else 1, preview_factor if preview_path else 1)
+    strip_rows = max(unit, strip_rows // unit * unit)
+    preview_strips = []
+    if tile_dir: os.makedirs(os.path.join(tile_dir, "0"), exist_ok=True)
+    with PngStreamWriter(output_path, img_w, img_h) as writer:
+        for y0 in range(0, img_h, strip_rows):
+            strip = _render_strip(cv_image, y0, min(y0 + strip_rows, img_h), accepted, accepted_extents, removed, removed_extents)
+            writer.write_rows(strip)
+            if tile_dir:
+                for offset in range(0, strip.shape[0], tile_size):
+                    _write_tile_row(tile_dir, strip[offset:offset + tile_size], (y0 + offset) // tile_size, tile_size)
+            if preview_path:
+                preview_size = (-(-img_w // preview_factor), -(-strip.shape[0] // preview_factor))
+                preview_strips.append(cv2.resize(strip, preview_size, interpolation=cv2.INTER_AREA))
+    if preview_path: _write_image(preview_path, np.vstack(preview_strips))
+    if tile_dir: _build_tile_pyramid(tile_dir, img_w, img_h, tile_size)
+    return len(accepted)
+
+# --- Folder Review Prefetching ---
+PLATE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+def list_plate_images(folder):
+    return sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.lower().endswith(PLATE_EXTENSIONS))
+
+def load_and_analyze_plate(path, num_threads=1):
+    cv_image = cv2.imread(path)
+    if cv_image is None: raise ValueError(f"Could not read image: {path}")
+    segments = analyze_image_segments(cv_image, num_threads)
+    nbytes = cv_image.nbytes + sum(seg['contour'].nbytes for seg in segments)
+    return {'image': cv_image, 'segments': segments, 'nbytes': nbytes}
+
+class PlatePrefetcher:
+    # Decodes and analyzes the plate under review and the ones following it on a
+    # background thread, always starting with the plate on screen. Finished plates stay
+    # cached (least recently used first out) within the byte budget; only the plate on
+    # screen is kept when it alone exceeds it. Queued work outside the window is cancelled.
+    def __init__(self, paths, num_threads=1, prefetch_count=2, max_cache_bytes=1 << 30):
+        self.paths = paths
+        self.num_threads = num_threads
+        self.prefetch_count = prefetch_count
+        self.max_cache_bytes = max_cache_bytes
+        self.futures = OrderedDict()
+        self.queue = []
+        self.window = []
+        self.last_nbytes = 0
+        self.closed = False
+        self.lock = threading.Condition()
+        # A daemon thread, so closing the window never waits for an analysis in progress.
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def _run(self):
+        while True:
+            with self.lock:
+                while not self.queue and not self.closed: self.lock.wait()
+                if self.closed: return
+                index = self.queue.pop(0)
+                future = self.futures[index]
+                if not future.set_running_or_notify_cancel(): continue
+            try: result = load_and_analyze_plate(self.paths[index], self.num_threads)
+            except Exception as e: future.set_exception(e); continue
+            future.set_result(result)
+            with self.lock:
+                self.last_nbytes = result['nbytes']
+                self._evict()
+
+    def request(self, index):
+        with self.lock:
+            # Prefetch only as many plates as fit in the budget next to the current one.
+            # Until a plate has finished its size is unknown, so start with a single prefetch.
+            prefetch_count = min(self.prefetch_count, 1)
+            if self.last_nbytes: prefetch_count = min(self.prefetch_count, max(0, self.max_cache_bytes // self.last_nbytes - 1))
+            window = [i for i in range(index, index + prefetch_count + 1) if i < len(self.paths)]
+            for i, future in list(self.futures.items()):
+                if i not in window and future.cancel(): del self.futures[i]
+            for i in window:
+                if i not in self.futures: self.futures[i] = Future()
+            # Rebuilt on every request, so pending prefetches never run ahead of the plate on screen.
+            self.queue = [i for i in window if not (self.futures[i].running() or self.futures[i].done())]
+            self.window = window
+            self.futures.move_to_end(index)
+            self._evict()
+            self.lock.notify()
+            return self.futures[index]
+
+    def _evict(self):
+        def cached_bytes():
+            return sum(f.result()['nbytes'] for f in self.futures.values() if f.done() and not f.cancelled() and f.exception() is None)
+        # Plates outside the window go first (least recently used first), then prefetched
+        # plates from the far end of the window; the plate on screen is never dropped.
+        order = [i for i in self.futures if i not in self.window] + self.window[:0:-1]
+        for i in order:
+            future = self.futures.get(i)
+            if future is None or not future.done(): continue
+            if future.cancelled() or future.exception() is not None or cached_bytes() > self.max_cache_bytes:
+                del self.futures[i]
+
+    def close(self):
+        with self.lock:
+            for future in self.futures.values(): future.cancel()
+            self.futures.clear()
+            self.queue = []
+            self.closed = True
+            self.lock.notify()
 
 # --- Custom Range Slider Widget ---
 class CustomRangeSlider(tk.Canvas):
@@ -127,11 +423,11 @@ class RoundedButton(tk.Canvas):
 
 # --- Main Application Class ---
 class ParticleCounterApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, num_threads=None, prefetch_count=2, cache_mb=1024):
         super().__init__()
         self.title("CR-39 Particle Counter")
         self.geometry("1200x800")
-        self.minsize(900, 650)
+        self.minsize(1050, 650)
 
         self.padding = 10
         self.header_height = 90
@@ -170,6 +466,17 @@ class ParticleCounterApp(tk.Tk):
         self.default_r = 10
         
         self.tolerance = 2  # pixels tolerance for clicking near contour
+
+        self.num_threads = num_threads or os.cpu_count() or 1
+
+        self.prefetch_count = prefetch_count
+        self.max_cache_bytes = cache_mb * 1024 * 1024
+        self.prefetcher = None
+        self.plate_paths = []
+        self.plate_index = -1
+        self.review_state = {}
+        self.plate_loading = False
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
         self.setup_styles()
         self.create_header()
@@ -191,8 +498,11 @@ class ParticleCounterApp(tk.Tk):
         self.header_frame.grid_columnconfigure(0, weight=0, minsize=80)
         self.header_frame.grid_columnconfigure(1, weight=0, minsize=80)
         self.header_frame.grid_columnconfigure(2, weight=0, minsize=80)
-        self.header_frame.grid_columnconfigure(3, weight=0, minsize=180)
-        self.header_frame.grid_columnconfigure(4, weight=1, minsize=300)
+        self.header_frame.grid_columnconfigure(3, weight=0, minsize=80)
+        self.header_frame.grid_columnconfigure(4, weight=0, minsize=80)
+        self.header_frame.grid_columnconfigure(5, weight=0, minsize=80)
+        self.header_frame.grid_columnconfigure(6, weight=0, minsize=180)
+        self.header_frame.grid_columnconfigure(7, weight=1, minsize=300)
         self.header_frame.grid_rowconfigure(0, weight=1)
 
     def create_image_area(self):
@@ -221,10 +531,11 @@ class ParticleCounterApp(tk.Tk):
         self.image_canvas.focus_set()
 
     def setup_controls(self):
-        self.min_area_var = tk.DoubleVar(value=75)
-        self.max_area_var = tk.DoubleVar(value=2000)
-        self.min_circ_var = tk.DoubleVar(value=0.65)
-        self.max_circ_var = tk.DoubleVar(value=1.00)
+        min_area, max_area, min_circ, max_circ = DEFAULT_FILTER_RANGES
+        self.min_area_var = tk.DoubleVar(value=min_area)
+        self.max_area_var = tk.DoubleVar(value=max_area)
+        self.min_circ_var = tk.DoubleVar(value=min_circ)
+        self.max_circ_var = tk.DoubleVar(value=max_circ)
         
         self.min_area_str_var = tk.StringVar(value=f"{self.min_area_var.get():.2f}")
         self.max_area_str_var = tk.StringVar(value=f"{self.max_area_var.get():.2f}")
@@ -238,22 +549,45 @@ class ParticleCounterApp(tk.Tk):
         self.load_button = RoundedButton(upload_frame, text="Upload\nImage", command=self.load_image, colors=self.colors, width=70, height=40)
         self.load_button.pack(anchor='center')
 
+        folder_frame = ttk.Frame(self.header_frame, style="Header.TFrame")
+        folder_frame.grid(row=0, column=1, sticky='nsew', padx=(5, 5), pady=10)
+        folder_frame.grid_rowconfigure(0, weight=1)
+        
+        self.folder_button = RoundedButton(folder_frame, text="Open\nFolder", command=self.open_folder, colors=self.colors, width=70, height=40)
+        self.folder_button.pack(anchor='center')
+
+        nav_frame = ttk.Frame(self.header_frame, style="Header.TFrame")
+        nav_frame.grid(row=0, column=2, sticky='nsew', padx=(5, 5), pady=10)
+        nav_frame.grid_rowconfigure(0, weight=1)
+        
+        self.prev_button = RoundedButton(nav_frame, text="◀", command=self.show_previous_plate, colors=self.colors, width=33, height=40)
+        self.prev_button.pack(side='left', anchor='center', padx=(0, 2))
+        self.next_button = RoundedButton(nav_frame, text="▶", command=self.show_next_plate, colors=self.colors, width=33, height=40)
+        self.next_button.pack(side='left', anchor='center')
+
         save_frame = ttk.Frame(self.header_frame, style="Header.TFrame")
-        save_frame.grid(row=0, column=1, sticky='nsew', padx=(5, 5), pady=10)
+        save_frame.grid(row=0, column=3, sticky='nsew', padx=(5, 5), pady=10)
         save_frame.grid_rowconfigure(0, weight=1)
         
         self.save_button = RoundedButton(save_frame, text="Save\nResults", command=self.save_results, colors=self.colors, width=70, height=40)
         self.save_button.pack(anchor='center')
 
+        export_frame = ttk.Frame(self.header_frame, style="Header.TFrame")
+        export_frame.grid(row=0, column=4, sticky='nsew', padx=(5, 5), pady=10)
+        export_frame.grid_rowconfigure(0, weight=1)
+        
+        self.export_button = RoundedButton(export_frame, text="Export\nImage", command=self.export_image, colors=self.colors, width=70, height=40)
+        self.export_button.pack(anchor='center')
+
         edit_frame = ttk.Frame(self.header_frame, style="Header.TFrame")
-        edit_frame.grid(row=0, column=2, sticky='nsew', padx=(5, 5), pady=10)
+        edit_frame.grid(row=0, column=5, sticky='nsew', padx=(5, 5), pady=10)
         edit_frame.grid_rowconfigure(0, weight=1)
         
         self.edit_button = RoundedButton(edit_frame, text="Edit\nParticles", command=self.toggle_edit_mode, colors=self.colors, width=70, height=40)
         self.edit_button.pack(anchor='center')
 
         count_frame = ttk.Frame(self.header_frame, style="Header.TFrame")
-        count_frame.grid(row=0, column=3, sticky='nsew', padx=(5, 10), pady=10)
+        count_frame.grid(row=0, column=6, sticky='nsew', padx=(5, 10), pady=10)
         count_frame.grid_rowconfigure(0, weight=1)
         
         self.count_var = tk.StringVar(value="Particle Count: --")
@@ -264,7 +598,7 @@ class ParticleCounterApp(tk.Tk):
         count_entry.pack(anchor='center')
 
         right_frame = ttk.Frame(self.header_frame, style="Header.TFrame")
-        right_frame.grid(row=0, column=4, sticky='nsew', padx=(10, 15), pady=10)
+        right_frame.grid(row=0, column=7, sticky='nsew', padx=(10, 15), pady=10)
         right_frame.grid_rowconfigure(0, weight=1)
         right_frame.grid_columnconfigure(0, weight=1)
         right_frame.grid_columnconfigure(1, weight=1)
@@ -324,7 +658,7 @@ class ParticleCounterApp(tk.Tk):
         circ_max_entry.pack(side='left', padx=(3, 0))
 
         self.control_widgets = [area_min_entry, area_max_entry, self.area_slider, 
-                               circ_min_entry, circ_max_entry, self.circ_slider, self.save_button, self.edit_button]
+                               circ_min_entry, circ_max_entry, self.circ_slider, self.save_button, self.export_button, self.edit_button]
 
         self._is_updating_from_trace = False
         def setup_two_way_binding(d_var, s_var, entry_widget):
@@ -366,6 +700,7 @@ class ParticleCounterApp(tk.Tk):
 
 
     def on_canvas_click(self, event):
+        if self.plate_loading: return
         if self.edit_mode:
             self.manual_edit(event)
         else:
@@ -469,27 +804,93 @@ class ParticleCounterApp(tk.Tk):
     def load_image(self):
         filepath = filedialog.askopenfilename(title="Select a CR-39 Image File", filetypes=[("Image Files", "*.png *.jpg *.jpeg *.bmp *.tif")])
         if not filepath: return
+        self.close_folder()
+        cv_image = cv2.imread(filepath)
+        print("Image loaded, starting analysis...")
+        segments = analyze_image_segments(cv_image, self.num_threads)
+        print(f"Analysis complete. Found {len(segments)} potential segments.")
+        self.set_image(filepath, cv_image, segments)
+
+    def set_image(self, filepath, cv_image, segments, manual_additions=None, manual_removals=None):
         self.current_image_path, self.current_image_name = filepath, os.path.basename(filepath)
         self.zoom_factor, self.image_offset_x, self.image_offset_y = 1.0, 0, 0
         self.hide_zoom_controls()
-        self.original_cv_image = cv2.imread(filepath)
-        print("Image loaded, starting analysis...")
-        self.all_segments = analyze_image_segments(self.original_cv_image)
-        print(f"Analysis complete. Found {len(self.all_segments)} potential segments.")
+        self.original_cv_image = cv_image
+        self.all_segments = segments
         if self.all_segments:
             areas = [s['area'] for s in self.all_segments]
             avg_area = np.mean(areas)
             self.default_r = int(np.sqrt(avg_area / np.pi))
         else:
             self.default_r = 10
-        self.manual_additions = []
-        self.manual_removals = set()
+        self.manual_additions = manual_additions if manual_additions is not None else []
+        self.manual_removals = manual_removals if manual_removals is not None else set()
         self.update_controls_state("normal")
         self.update_display()
         self.show_zoom_controls()
 
+    def open_folder(self, folder=None):
+        folder = folder or filedialog.askdirectory(title="Select a Folder of CR-39 Images")
+        if not folder: return
+        paths = list_plate_images(folder)
+        if not paths: messagebox.showwarning("No Images", f"No image files found in:\n{folder}"); return
+        self.close_folder()
+        self.plate_paths = paths
+        self.prefetcher = PlatePrefetcher(paths, self.num_threads, self.prefetch_count, self.max_cache_bytes)
+        self.show_plate(0)
+
+    def close_folder(self):
+        if self.prefetcher: self.prefetcher.close()
+        self.prefetcher, self.plate_paths, self.plate_index, self.review_state = None, [], -1, {}
+        self.plate_loading = False
+        self.title("CR-39 Particle Counter")
+
+    def show_next_plate(self): self.show_plate(self.plate_index + 1)
+    def show_previous_plate(self): self.show_plate(self.plate_index - 1)
+
+    def show_plate(self, index):
+        if not self.plate_paths or not 0 <= index < len(self.plate_paths): return
+        self.plate_index = index
+        future = self.prefetcher.request(index)
+        if not future.done():
+            # The previous plate stays visible while loading; lock it so edits, saves and
+            # exports cannot be applied to it by mistake.
+            self.plate_loading = True
+            self.update_controls_state("disabled")
+        self._wait_for_plate(self.prefetcher, index, future)
+
+    def _wait_for_plate(self, prefetcher, index, future):
+        # Stale once another plate or another folder has been requested.
+        if prefetcher is not self.prefetcher or index != self.plate_index or future.cancelled(): return
+        if not future.done():
+            self.config(cursor="watch")
+            self.after(30, lambda: self._wait_for_plate(prefetcher, index, future))
+            return
+        self.config(cursor="")
+        self.plate_loading = False
+        path = self.plate_paths[index]
+        plate_label = f"{os.path.basename(path)} ({index + 1}/{len(self.plate_paths)})"
+        try: plate = future.result()
+        except Exception as e:
+            # Stay on the failed index so next/previous step past it; the title says which plate is still shown.
+            if self.original_cv_image is not None:
+                self.update_controls_state("normal")
+                self.title(f"CR-39 Particle Counter - {plate_label} could not be loaded, showing {self.current_image_name}")
+            else:
+                self.title(f"CR-39 Particle Counter - {plate_label} could not be loaded")
+            messagebox.showerror("Error", f"Failed to load image:\n{path}\n{str(e)}"); return
+        # Edits are kept per plate (the lists are shared, not copied) so stepping back and forth does not lose them.
+        manual_additions, manual_removals = self.review_state.setdefault(path, ([], set()))
+        self.set_image(path, plate['image'], plate['segments'], manual_additions, manual_removals)
+        self.title(f"CR-39 Particle Counter - {plate_label}")
+
+    def on_close(self):
+        self.close_folder()
+        self.destroy()
+
     def save_results(self):
         if self.original_cv_image is None: messagebox.showwarning("No Image", "Please load an image first."); return
+        if self.plate_loading: return
         min_area, max_area = round(self.min_area_var.get(), 2), round(self.max_area_var.get(), 2)
         min_circ, max_circ = round(self.min_circ_var.get(), 2), round(self.max_circ_var.get(), 2)
         result_text = f"Particle Counts: {self.current_particle_count} in image {self.current_image_name} of min area: {min_area}, max area: {max_area} and circularity between {min_circ} - {max_circ}."
@@ -502,6 +903,22 @@ class ParticleCounterApp(tk.Tk):
                 messagebox.showinfo("Success", f"Results saved successfully to:\n{save_path}")
             except Exception as e: messagebox.showerror("Error", f"Failed to save file:\n{str(e)}")
 
+    def get_filter_ranges(self):
+        return (self.min_area_var.get(), self.max_area_var.get(), self.min_circ_var.get(), self.max_circ_var.get())
+
+    def export_image(self):
+        if self.original_cv_image is None: messagebox.showwarning("No Image", "Please load an image first."); return
+        if self.plate_loading: return
+        default_filename = f"annotated_{self.current_image_name.split('.')[0]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        save_path = filedialog.asksaveasfilename(title="Export Annotated Image", defaultextension=".png", initialfile=default_filename, filetypes=[("PNG Image", "*.png")])
+        if save_path:
+            try:
+                self.config(cursor="watch"); self.update_idletasks()
+                export_annotated_image(self.original_cv_image, self.all_segments, self.manual_additions, self.manual_removals, self.get_filter_ranges(), save_path)
+                messagebox.showinfo("Success", f"Annotated image exported to:\n{save_path}")
+            except Exception as e: messagebox.showerror("Error", f"Failed to export image:\n{str(e)}")
+            finally: self.config(cursor="")
+
     def schedule_update(self, changed_var=None):
         if self._update_job: self.after_cancel(self._update_job)
         self._update_job = self.after(20, self.update_display)
@@ -568,24 +985,14 @@ class ParticleCounterApp(tk.Tk):
             self.constrain_pan_offset()
             display_w, display_h = int(img_w * self.zoom_factor), int(img_h * self.zoom_factor)
             scaled_display_image = cv2.resize(self.original_cv_image, (display_w, display_h), interpolation=cv2.INTER_AREA)
-            min_a, max_a = self.min_area_var.get(), self.max_area_var.get()
-            min_c, max_c = self.min_circ_var.get(), self.max_circ_var.get()
             display_image = scaled_display_image.copy()
-            particle_count = 0
             scale_factor_for_contours = self.zoom_factor
+            accepted, _ = select_particles(self.all_segments, self.manual_additions, self.manual_removals, self.get_filter_ranges())
+            particle_count = len(accepted)
             
-            for i, seg in enumerate(self.all_segments):
-                if i in self.manual_removals: continue
-                if min_a <= seg['area'] <= max_a and min_c <= seg['circularity'] <= max_c:
-                    particle_count += 1
-                    scaled_contour = (seg['contour'] * scale_factor_for_contours).astype(np.int32)
-                    cv2.drawContours(display_image, [scaled_contour], -1, (0, 255, 0), 1)
-            
-            for seg in self.manual_additions:
-                if min_a <= seg['area'] <= max_a and min_c <= seg['circularity'] <= max_c:
-                    particle_count += 1
-                    scaled_contour = (seg['contour'] * scale_factor_for_contours).astype(np.int32)
-                    cv2.drawContours(display_image, [scaled_contour], -1, (0, 255, 0), 1)
+            for seg in accepted:
+                scaled_contour = (seg['contour'] * scale_factor_for_contours).astype(np.int32)
+                cv2.drawContours(display_image, [scaled_contour], -1, ACCEPTED_COLOR, 1)
             
             self.current_particle_count = particle_count
             self.count_var.set(f"Particle Count: {particle_count}")
@@ -609,6 +1016,8 @@ class ParticleCounterApp(tk.Tk):
             self.constrain_pan_offset(); self.update_display()
 
     def on_key_press(self, event):
+        if event.keysym in ['Right', 'Next']: self.show_next_plate(); return
+        if event.keysym in ['Left', 'Prior']: self.show_previous_plate(); return
         if self.original_cv_image is None or not (event.state & 0x4): return
         if event.keysym in ['plus', 'equal', 'KP_Add']: self.zoom_in()
         elif event.keysym in ['minus', 'KP_Subtract']: self.zoom_out()
@@ -715,6 +1124,56 @@ class ParticleCounterApp(tk.Tk):
         points = np.column_stack((x, y)).astype(np.int32)
         return points.reshape((-1, 1, 2))
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="CR-39 Particle Counter")
+    parser.add_argument("--threads", type=int, default=None, help="worker threads for segmenting one image (default: all cores)")
+    parser.add_argument("--folder", metavar="DIR", help="start in folder review mode on the images in DIR")
+    parser.add_argument("--prefetch", type=int, default=2, help="number of upcoming plates analyzed in the background during folder review")
+    parser.add_argument("--cache-mb", type=int, default=1024, help="memory budget for analyzed plates kept during folder review")
+    parser.add_argument("--benchmark", metavar="IMAGE", help="time segmentation of IMAGE across thread counts and exit")
+    parser.add_argument("--export", nargs=2, metavar=("IMAGE", "OUTPUT"), help="analyze IMAGE headlessly and write the annotated full-resolution OUTPUT .png")
+    parser.add_argument("--min-area", type=float, default=DEFAULT_FILTER_RANGES[0])
+    parser.add_argument("--max-area", type=float, default=DEFAULT_FILTER_RANGES[1])
+    parser.add_argument("--min-circ", type=float, default=DEFAULT_FILTER_RANGES[2])
+    parser.add_argument("--max-circ", type=float, default=DEFAULT_FILTER_RANGES[3])
+    parser.add_argument("--strip-rows", type=int, default=512, help="rows rendered and encoded at a time during export")
+    parser.add_argument("--preview", metavar="PATH", help="also write a downsampled preview image")
+    parser.add_argument("--preview-factor", type=int, default=8, help="downsampling factor of the preview")
+    parser.add_argument("--tiles", metavar="DIR", help="also write a tile pyramid (DIR/<level>/<row>_<col>.png, level 0 is full resolution)")
+    parser.add_argument("--tile-size", type=int, default=256)
+    return parser.parse_args(argv)
+
+def run_benchmark(image_path, max_threads):
+    cv_image = cv2.imread(image_path)
+    if cv_image is None: raise SystemExit(f"Could not read image: {image_path}")
+    thread_counts, n = [], 1
+    while n < max_threads: thread_counts.append(n); n *= 2
+    thread_counts.append(max_threads)
+    print(f"Segmenting {os.path.basename(image_path)} ({cv_image.shape[1]}x{cv_image.shape[0]})")
+    print(f"{'threads':>8} {'seconds':>9} {'speedup':>8}")
+    for num_threads, seconds, speedup in benchmark_segmentation(cv_image, thread_counts):
+        print(f"{num_threads:>8} {seconds:>9.3f} {speedup:>7.2f}x")
+
+def run_export(args):
+    image_path, output_path = args.export
+    options = dict(strip_rows=args.strip_rows, preview_path=args.preview, preview_factor=args.preview_factor, tile_dir=args.tiles, tile_size=args.tile_size)
+    try: check_export_options(output_path, **options)
+    except (OSError, ValueError) as e: raise SystemExit(f"Export failed: {e}")
+    cv_image = cv2.imread(image_path)
+    if cv_image is None: raise SystemExit(f"Could not read image: {image_path}")
+    segments = analyze_image_segments(cv_image, args.threads or os.cpu_count() or 1)
+    filter_ranges = (args.min_area, args.max_area, args.min_circ, args.max_circ)
+    try: count = export_annotated_image(cv_image, segments, [], set(), filter_ranges, output_path, **options)
+    except (OSError, ValueError, cv2.error) as e: raise SystemExit(f"Export failed: {e}")
+    print(f"Particle Counts: {count} in image {os.path.basename(image_path)}, annotated image written to {output_path}")
+
 if __name__ == "__main__":
-    app = ParticleCounterApp()
-    app.mainloop()
\ No newline at end of file
+    args = parse_args()
+    if args.benchmark:
+        run_benchmark(args.benchmark, args.threads or os.cpu_count() or 1)
+    elif args.export:
+        run_export(args)
+    else:
+        app = ParticleCounterApp(num_threads=args.threads, prefetch_count=args.prefetch, cache_mb=args.cache_mb)
+        if args.folder: app.after(100, lambda: app.open_folder(args.folder))
+        app.mainloop()
\ No newline at end of file